@@ -1,11 +1,57 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 import heapq
 import math
-from pysat.formula import CNF
-from pysat.solvers import Minisat22
+import time
+
+# pysat is imported on first use, see load_sat_backend
+CNF = None
+Minisat22 = None
+
+
+def load_sat_backend():
+    """Import the SAT solver backend once per process.
+
+    Short-lived jobs that never reason over the KB skip the import
+    entirely; long-lived servers and worker pools can call this up front
+    (e.g. as a multiprocessing.Pool initializer) to start warm.
+    """
+    global CNF, Minisat22
+
+    if CNF is None:
+        from pysat.formula import CNF as _CNF
+        from pysat.solvers import Minisat22 as _Minisat22
+
+        CNF, Minisat22 = _CNF, _Minisat22
+
+# lookahead planner tuning, in the same units as risk()
+PLANNERS = ("cascade", "expectimax")
+EXPLORE_REWARD = 10.0
+DEATH_PENALTY = 100.0
+STEP_COST = 0.5
+DISCOUNT = 0.95
+PLAN_CACHE_LIMIT = 200_000
+
+# hazard rates for cells with no evidence yet, DEFAULT_CONFIG in world.ts
+PIT_PRIOR = 0.2
+WUMPUS_PRIOR = 0.08
+
+# kind -> (percept, confirmed flag, prior), see hazard_posterior
+HAZARDS = {
+    "pit": ("breeze", "confirmed_pit", PIT_PRIOR),
+    "wumpus": ("stench", "confirmed_wumpus", WUMPUS_PRIOR),
+}
+
+# fire when some cell on the line scores above this p_wumpus (see shot_value)
+SHOT_THRESHOLD = 0.65
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class PlanTimeout(Exception):
+    pass
+
 
 class Agent:
-    def __init__(self, world, arrows=0):
+    def __init__(self, world, arrows=0, board=None, planner="cascade", plan_budget=0.05):
         self.world = world
         self.size = len(world)
         self.pos = (0, 0)
@@ -38,16 +84,43 @@ class Agent:
 
         self.knowledge[0][0]["safe"] = True
 
+        # cells an arrow flew through without hitting anything
+        self.no_wumpus = set()
+
         self.var_map = {}
         self.rev_map = {}
         self.next_var = 1
 
+        # "cascade" walks the fixed mode list in next_move, "expectimax"
+        # replaces its FRONTIER gamble with a plan_budget-second search.
+        # expectimax is experimental: on seeded bench.py runs it ties the
+        # cascade on wins, more budget only buys search depth
+        if planner not in PLANNERS:
+            raise ValueError(f"unknown planner {planner!r}, expected one of {PLANNERS}")
+        if isinstance(plan_budget, bool) or not isinstance(plan_budget, (int, float)) \
+                or not plan_budget > 0:
+            raise ValueError(f"plan_budget must be a positive number of seconds, got {plan_budget!r}")
+
+        self.planner = planner
+        self.plan_budget = plan_budget
+        self.plan_cache = {}
+        self.plan_beliefs = {}
+        self.plan_signature = None
+        self.plan_target = None
+
+        # optional SharedBoard mirror read by workers / the server,
+        # knowledge is copied over lazily by sync_board()
+        self.board = None
+        self.board_dirty = False
+        if board is not None:
+            self.attach_board(board)
+
     # --------------------------------------------------
     # BASIC WORLD OPS
     # --------------------------------------------------
 
     def neighbors(self, i, j):
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
+        for di, dj in DIRECTIONS:
             ni, nj = i + di, j + dj
             if 0 <= ni < self.size and 0 <= nj < self.size:
                 yield (ni, nj)
@@ -58,6 +131,23 @@ class Agent:
             if 0 <= ni < self.size and 0 <= nj < self.size:
                 yield ni, nj
                 
+    def set_tile(self, i, j, value):
+        self.world[i][j] = value
+        if self.board is not None:
+            self.board.write_cell(i, j, value)
+
+    def attach_board(self, board):
+        self.board = board
+        board.write_world(self.world)
+        board.write_knowledge(self.knowledge)
+        self.board_dirty = False
+
+    def sync_board(self):
+        # one encode per emit instead of one per belief pass
+        if self.board is not None and self.board_dirty:
+            self.board.write_knowledge(self.knowledge)
+            self.board_dirty = False
+
     def is_corner(self, i, j):
         return (i == 0 or i == self.size - 1) and (j == 0 or j == self.size - 1)
 
@@ -116,6 +206,7 @@ class Agent:
     # --------------------------------------------------
 
     def build_cnf(self):
+        load_sat_backend()
         cnf = CNF()
 
         for i in range(self.size):
@@ -126,6 +217,9 @@ class Agent:
                 # not both pit and wumpus
                 cnf.append([-P, -W])
 
+                if (i, j) in self.no_wumpus:
+                    cnf.append([-W])
+
                 c = self.knowledge[i][j]
 
                 if c["visited"]:
@@ -150,8 +244,9 @@ class Agent:
 
         return cnf
 
-    def sat_entails(self, literal):
-        cnf = self.build_cnf()
+    def sat_entails(self, literal, cnf=None):
+        if cnf is None:
+            cnf = self.build_cnf()
 
         with Minisat22(bootstrap_with=cnf) as solver:
             if not solver.solve():
@@ -169,32 +264,78 @@ class Agent:
         for i in range(self.size):
             for j in range(self.size):
                 c = self.knowledge[i][j]
-                c["p_pit"] = 0.0
-                c["p_wumpus"] = 0.0
                 if not c["visited"]:
                     c["safe"] = False
                     c["confirmed_pit"] = False
                     c["confirmed_wumpus"] = False
 
         # ---------- SAT LOGICAL PASSES ----------
+        cnf = self.build_cnf()
         for i in range(self.size):
             for j in range(self.size):
-                if self.knowledge[i][j]["visited"]:
-                    continue
+                if not self.knowledge[i][j]["visited"]:
+                    self.classify_cell(i, j, cnf)
 
-                P = self.pit_var(i, j)
-                W = self.wumpus_var(i, j)
+        self.update_probabilities()
+
+    def classify_cell(self, i, j, cnf):
+        c = self.knowledge[i][j]
+        P = self.pit_var(i, j)
+        W = self.wumpus_var(i, j)
 
-                if self.sat_entails(P):
-                    self.knowledge[i][j]["confirmed_pit"] = True
-                    self.knowledge[i][j]["safe"] = False
+        if self.sat_entails(P, cnf):
+            c["confirmed_pit"] = True
+            c["safe"] = False
 
-                elif self.sat_entails(W):
-                    self.knowledge[i][j]["confirmed_wumpus"] = True
-                    self.knowledge[i][j]["safe"] = False
+        elif self.sat_entails(W, cnf):
+            c["confirmed_wumpus"] = True
+            c["safe"] = False
 
-                elif self.sat_entails(-P) and self.sat_entails(-W):
-                    self.knowledge[i][j]["safe"] = True
+        elif self.sat_entails(-P, cnf) and self.sat_entails(-W, cnf):
+            c["safe"] = True
+
+    def clause_partners(self, i, j):
+        """Unvisited cells sharing a percept clause with (i, j)."""
+        out = set()
+        for vi, vj in self.neighbors(i, j):
+            if self.knowledge[vi][vj]["visited"]:
+                for n in self.neighbors(vi, vj):
+                    if not self.knowledge[n[0]][n[1]]["visited"]:
+                        out.add(n)
+        return out
+
+    def refresh_beliefs(self, cells):
+        """Re-derive only the given cells, following changes outwards.
+
+        A cell's entailments can only change through the percept clauses it
+        shares with other cells, so whenever a cell's status flips its
+        clause partners are re-checked too.
+        """
+        cnf = self.build_cnf()
+        queue = deque(cells)
+        seen = set()
+
+        while queue:
+            i, j = queue.popleft()
+            c = self.knowledge[i][j]
+            if (i, j) in seen or c["visited"]:
+                continue
+            seen.add((i, j))
+
+            before = (c["safe"], c["confirmed_pit"], c["confirmed_wumpus"])
+            c["safe"] = c["confirmed_pit"] = c["confirmed_wumpus"] = False
+            self.classify_cell(i, j, cnf)
+
+            if before != (c["safe"], c["confirmed_pit"], c["confirmed_wumpus"]):
+                queue.extend(self.clause_partners(i, j))
+
+        self.update_probabilities()
+
+    def update_probabilities(self):
+        for row in self.knowledge:
+            for c in row:
+                c["p_pit"] = 0.0
+                c["p_wumpus"] = 0.0
 
         # ---------- PROBABILISTIC SUPPORT ----------
         pit_support = defaultdict(int)
@@ -246,6 +387,8 @@ class Agent:
 
         for (i, j), s in wumpus_support.items():
             c = self.knowledge[i][j]
+            if (i, j) in self.no_wumpus:
+                continue
             if not c["safe"] and not c["confirmed_wumpus"]:
                 c["p_wumpus"] = support_to_prob(s, i, j)
 
@@ -285,6 +428,8 @@ class Agent:
                     c["p_pit"] = 0.0
                     c["p_wumpus"] = 0.0
 
+        self.board_dirty = True
+
     # --------------------------------------------------
     # RISK + PATHFINDING
     # --------------------------------------------------
@@ -408,26 +553,366 @@ class Agent:
             if self.knowledge[i][j]["confirmed_wumpus"]
         ]
         
+    def firing_positions(self, wi, wj):
+        """Known-safe cells with the wumpus somewhere on their row or column."""
+        out = []
+        for di, dj in DIRECTIONS:
+            i, j = wi + di, wj + dj
+            while 0 <= i < self.size and 0 <= j < self.size:
+                c = self.knowledge[i][j]
+                if c["visited"] or c["safe"]:
+                    out.append((i, j))
+                i += di
+                j += dj
+        return out
+
     def hunt_wumpus(self):
-        targets = self.confirmed_wumpus_cells()
         best = None
         best_cost = 1e9
 
-        for wi, wj in targets:
-            path, cost = self.astar(
-                (wi, wj),
-                allow_target_wumpus=True
+        for wi, wj in self.confirmed_wumpus_cells():
+            for cell in self.firing_positions(wi, wj):
+                path, cost = self.astar(cell)
+                if path and cost < best_cost:
+                    best = path
+                    best_cost = cost
+
+        return best
+
+    # --------------------------------------------------
+    # LOOKAHEAD PLANNER
+    # --------------------------------------------------
+
+    def death_prob(self, i, j):
+        c = self.knowledge[i][j]
+        if c["confirmed_pit"] or c["confirmed_wumpus"]:
+            return 1.0
+        if c["visited"] or c["safe"]:
+            return 0.0
+        if (i, j) in self.plan_beliefs:
+            p_pit, p_wumpus = self.plan_beliefs[i, j]
+        else:
+            # a cell SAT has not proven safe is never free, even with no support
+            p_pit = max(c["p_pit"], PIT_PRIOR)
+            p_wumpus = max(c["p_wumpus"], WUMPUS_PRIOR)
+        return 1 - (1 - p_pit) * (1 - p_wumpus)
+
+    def hazard_posterior(self, kind, deadline):
+        """Exact P(hazard) for the cells next to a percept, given the KB.
+
+        Enumerates every placement of one hazard kind over those cells that
+        explains the percepts, weighted by the prior. Like createWorld, no two
+        hazards of the same kind are ever next to each other, diagonals
+        included. Returns None if the KB allows no placement (an edited
+        world), raises PlanTimeout past the deadline.
+        """
+        percept, confirmed, prior = HAZARDS[kind]
+
+        def ruled_out(i, j):
+            c = self.knowledge[i][j]
+            if c["visited"] or c["safe"]:
+                return True
+            if kind == "wumpus" and (i, j) in self.no_wumpus:
+                return True
+            if any(
+                self.knowledge[x][y]["visited"] and not self.knowledge[x][y]["percepts"].get(percept)
+                for x, y in self.neighbors(i, j)
+            ):
+                return True
+            return any(
+                self.knowledge[x][y][confirmed]
+                for x, y in [*self.neighbors(i, j), *self.diagonals(i, j)]
+            )
+
+        # percept clauses still waiting for a hazard, and the cells they allow
+        clauses = []
+        for i in range(self.size):
+            for j in range(self.size):
+                c = self.knowledge[i][j]
+                if not (c["visited"] and c["percepts"].get(percept)):
+                    continue
+                nbrs = list(self.neighbors(i, j))
+                if any(self.knowledge[x][y][confirmed] for x, y in nbrs):
+                    continue
+                clause = [
+                    n for n in nbrs
+                    if not self.knowledge[n[0]][n[1]][confirmed] and not ruled_out(*n)
+                ]
+                if not clause:
+                    return None
+                clauses.append(clause)
+
+        cells = sorted({n for clause in clauses for n in clause})
+        index = {cell: k for k, cell in enumerate(cells)}
+        clash = [
+            [index[n] for n in [*self.neighbors(*cell), *self.diagonals(*cell)] if n in index]
+            for cell in cells
+        ]
+        watching = [[] for _ in cells]
+        for clause in clauses:
+            ids = [index[n] for n in clause]
+            for k in ids:
+                watching[k].append(ids)
+
+        assignment = [None] * len(cells)
+        posterior = [0.0] * len(cells)
+        nodes = 0
+
+        def consistent(k):
+            if assignment[k]:
+                return not any(assignment[n] for n in clash[k])
+            # a clause fails once every cell in it is assigned False
+            return all(
+                any(assignment[n] is not False for n in ids)
+                for ids in watching[k]
             )
-            if path and cost < best_cost:
-                best = path
-                best_cost = cost
 
+        def enumerate_group(order):
+            totals = [0.0] * len(order)
+            mass = 0.0
+
+            def search(depth, weight):
+                nonlocal mass, nodes
+                nodes += 1
+                if nodes % 512 == 0 and time.perf_counter() > deadline:
+                    raise PlanTimeout
+                if depth == len(order):
+                    mass += weight
+                    for pos, k in enumerate(order):
+                        if assignment[k]:
+                            totals[pos] += weight
+                    return
+                k = order[depth]
+                for value, p in ((True, prior), (False, 1 - prior)):
+                    assignment[k] = value
+                    if consistent(k):
+                        search(depth + 1, weight * p)
+                assignment[k] = None
+
+            search(0, 1.0)
+            return mass, totals
+
+        # cells only interact through shared clauses or adjacency, so each
+        # connected group is enumerated on its own
+        seen = set()
+        for start in range(len(cells)):
+            if start in seen:
+                continue
+            order, stack = [], [start]
+            seen.add(start)
+            while stack:
+                k = stack.pop()
+                order.append(k)
+                linked = set(clash[k])
+                for ids in watching[k]:
+                    linked.update(ids)
+                for n in linked - seen:
+                    seen.add(n)
+                    stack.append(n)
+
+            mass, totals = enumerate_group(order)
+            if mass == 0:
+                return None
+            for pos, k in enumerate(order):
+                posterior[k] = totals[pos] / mass
+
+        out = {}
+        for i in range(self.size):
+            for j in range(self.size):
+                c = self.knowledge[i][j]
+                if c["visited"] or c["safe"] or c["confirmed_pit"] or c["confirmed_wumpus"]:
+                    continue
+                if (i, j) in index:
+                    out[i, j] = posterior[index[i, j]]
+                else:
+                    out[i, j] = 0.0 if ruled_out(i, j) else prior
+        return out
+
+    def posterior_beliefs(self, deadline):
+        """Per-cell (p_pit, p_wumpus) for the search, None if the KB allows none."""
+        pits = self.hazard_posterior("pit", deadline)
+        wumpuses = self.hazard_posterior("wumpus", deadline)
+        if pits is None or wumpuses is None:
+            return None
+        return {cell: (pits[cell], wumpuses[cell]) for cell in pits}
+
+    def belief_signature(self):
+        return tuple(
+            (c["visited"], c["safe"], c["confirmed_pit"], c["confirmed_wumpus"],
+             c["p_pit"], c["p_wumpus"])
+            for row in self.knowledge
+            for c in row
+        )
+
+    def is_known(self, i, j, explored):
+        c = self.knowledge[i][j]
+        return c["visited"] or c["safe"] or (i, j) in explored
+
+    def plan_frontier(self, explored):
+        """Unknown cells next to a visited or imagined-explored cell."""
+        out = []
+        for i in range(self.size):
+            for j in range(self.size):
+                c = self.knowledge[i][j]
+                if self.is_known(i, j, explored):
+                    continue
+                if c["confirmed_pit"] or c["confirmed_wumpus"]:
+                    continue
+                if any(
+                    self.knowledge[x][y]["visited"] or (x, y) in explored
+                    for x, y in self.neighbors(i, j)
+                ):
+                    out.append((i, j))
+        return out
+
+    def plan_q(self, cell, explored, depth, deadline):
+        """Expected value of stepping into an unknown cell.
+
+        Chance nodes branch on death, then on the percept: with no breeze
+        and no stench every unknown neighbour is entailed safe and gets
+        explored for free, otherwise only the cell itself is learned.
+        """
+        d = self.death_prob(*cell)
+
+        unknown = [n for n in self.neighbors(*cell) if not self.is_known(*n, explored)]
+        p_clean = 1.0
+        for n in unknown:
+            p_clean *= 1 - self.death_prob(*n)
+
+        dirty = explored | {cell}
+        clean = dirty | set(unknown)
+
+        v_dirty = DISCOUNT * self.plan_value(dirty, depth - 1, deadline)
+        v_clean = EXPLORE_REWARD * len(unknown)
+        if p_clean > 0:
+            v_clean += DISCOUNT * self.plan_value(clean, depth - 1, deadline)
+
+        survive = EXPLORE_REWARD + p_clean * v_clean + (1 - p_clean) * v_dirty
+        return (1 - d) * survive - d * DEATH_PENALTY
+
+    def plan_value(self, explored, depth, deadline):
+        if depth <= 0:
+            return 0.0
+
+        key = (explored, depth)
+        if key in self.plan_cache:
+            return self.plan_cache[key]
+
+        if time.perf_counter() > deadline or len(self.plan_cache) > PLAN_CACHE_LIMIT:
+            raise PlanTimeout
+
+        # stopping is always allowed, so a belief state is never worth < 0
+        best = 0.0
+        for cell in self.plan_frontier(explored):
+            best = max(best, self.plan_q(cell, explored, depth, deadline))
+
+        self.plan_cache[key] = best
         return best
 
+    def plan_move(self):
+        """Anytime iterative deepening expectimax over belief states.
+
+        Only runs once no known-safe cell is left to visit, so it picks the
+        gamble. The first half of the budget goes to exact hazard posteriors
+        for the root (hazard_posterior), falling back to the risk estimates
+        in the KB if it runs out; the rest deepens the search until every
+        unknown cell is covered. The transposition table only lives for one
+        search. The chosen target is kept until the beliefs change so the
+        agent doesn't turn around halfway.
+
+        Returns None when nothing can be reached, or when the budget ran out
+        before depth 1 finished. The cascade then handles this one step.
+        """
+        signature = self.belief_signature()
+        if signature != self.plan_signature:
+            self.plan_signature = signature
+            self.plan_target = None
+
+        target = self.plan_target
+        if target is None:
+            routes = {}
+            for cell in self.plan_frontier(frozenset()):
+                path, _ = self.astar(cell)
+                if path:
+                    routes[cell] = path
+
+            start = time.perf_counter()
+            deadline = start + self.plan_budget
+            try:
+                self.plan_beliefs = self.posterior_beliefs(start + self.plan_budget / 2) or {}
+            except PlanTimeout:
+                self.plan_beliefs = {}
+
+            unknown = sum(
+                1 for row in self.knowledge for c in row
+                if not (c["visited"] or c["safe"] or c["confirmed_pit"] or c["confirmed_wumpus"])
+            )
+            try:
+                for depth in range(1, unknown + 1):
+                    try:
+                        scored = [
+                            (self.plan_q(cell, frozenset(), depth, deadline)
+                             - STEP_COST * len(path), cell)
+                            for cell, path in routes.items()
+                        ]
+                    except PlanTimeout:
+                        break
+                    if scored:
+                        target = max(scored)[1]
+            finally:
+                self.plan_cache = {}
+                self.plan_beliefs = {}
+
+            if target is None:
+                return None
+            self.plan_target = target
+
+        path, _ = self.astar(target)
+        if not path:
+            self.plan_target = None
+            return None
+        return path[0]
+
     # --------------------------------------------------
     # SHOOTING LOGIC
     # --------------------------------------------------
 
+    def firing_line(self, di, dj):
+        i, j = self.pos[0] + di, self.pos[1] + dj
+        while 0 <= i < self.size and 0 <= j < self.size:
+            yield (i, j)
+            i += di
+            j += dj
+
+    def shot_value(self, di, dj):
+        """(best p_wumpus, expected wumpuses) along the firing line.
+
+        p_wumpus comes from support_to_prob: a score per cell, neither
+        calibrated nor independent of its neighbours, so the line is not
+        folded into one noisy-or hit chance. The best single cell is what
+        gets compared with SHOT_THRESHOLD, the scale the threshold was set
+        on, and the sum only breaks ties between lines.
+        """
+        best = 0.0
+        expected = 0.0
+        for i, j in self.firing_line(di, dj):
+            c = self.knowledge[i][j]
+            if c["confirmed_wumpus"]:
+                return 1.0, expected + 1.0
+            if (i, j) in self.no_wumpus:
+                continue
+            best = max(best, c["p_wumpus"])
+            expected += c["p_wumpus"]
+        return best, expected
+
+    def plan_shot(self):
+        best_value, best_dir = max(
+            (self.shot_value(di, dj), (di, dj)) for di, dj in DIRECTIONS
+        )
+        if best_value[0] > SHOT_THRESHOLD:
+            return best_dir
+        return None
+
     def shoot_arrow(self, target_i, target_j):
         ai, aj = self.pos
         di = 0 if target_i == ai else (1 if target_i > ai else -1)
@@ -438,7 +923,7 @@ class Agent:
 
         while 0 <= ci < self.size and 0 <= cj < self.size:
             if self.world[ci][cj] == "wumpus":
-                self.world[ci][cj] = "empty"
+                self.set_tile(ci, cj, "empty")
                 killed.append((ci, cj))
                 self.killed_wumpus_positions.append((ci, cj))
                 self.wumpus_kill_count += 1
@@ -448,7 +933,19 @@ class Agent:
 
         return killed
 
-    def update_beliefs_after_shot(self, killed_positions):
+    def update_beliefs_after_shot(self, killed_positions, direction=None):
+        changed = set(killed_positions)
+
+        # everything the arrow flew through before the hit (or the whole
+        # line on a miss) holds no wumpus
+        if direction is not None:
+            for cell in self.firing_line(*direction):
+                if cell in killed_positions:
+                    break
+                if cell not in self.no_wumpus:
+                    self.no_wumpus.add(cell)
+                    changed.add(cell)
+
         for wi, wj in killed_positions:
             c = self.knowledge[wi][wj]
             c["visited"] = True
@@ -458,13 +955,19 @@ class Agent:
             c["p_wumpus"] = 0.0
             c["p_pit"] = 0.0
 
-        # refresh percepts everywhere stench might change
-        for i in range(self.size):
-            for j in range(self.size):
+            # only the dead wumpus and its neighbours can change stench
+            for i, j in [(wi, wj), *self.neighbors(wi, wj)]:
                 if self.knowledge[i][j]["visited"]:
                     self.knowledge[i][j]["percepts"] = self.get_percepts(i, j)
 
-        self.rebuild_beliefs()
+        # the changed cells, their now-visited neighbours' clauses and the
+        # partners of every clause they sit in
+        affected = set(changed)
+        for i, j in changed:
+            affected |= set(self.neighbors(i, j))
+            affected |= self.clause_partners(i, j)
+
+        self.refresh_beliefs(affected)
 
     # --------------------------------------------------
     # MAIN LOOP
@@ -505,7 +1008,7 @@ class Agent:
             self.gold_found = True
             self.action = "PICK GOLD"
             self.returning = True
-            self.world[self.pos[0]][self.pos[1]] = "empty"
+            self.set_tile(*self.pos, "empty")
 
         # ARROW
         if percepts.get("arrow", False):
@@ -513,36 +1016,18 @@ class Agent:
             self.total_arrows_collected += 1
             self.action = "PICK ARROW"
             self.arrow_positions.append(self.pos)
-            self.world[self.pos[0]][self.pos[1]] = "empty"
+            self.set_tile(*self.pos, "empty")
 
         # SHOOT
         if self.arrows > 0:
-            # --- 1) IMMEDIATE shot if any neighbor is confirmed ---
-            for ni, nj in self.neighbors(*self.pos):
-                c = self.knowledge[ni][nj]
-                if c["confirmed_wumpus"]:
-                    self.action = "SHOOT ARROW"
-                    self.arrows -= 1
-                    killed = self.shoot_arrow(ni, nj)
-                    if killed:
-                        self.update_beliefs_after_shot(killed)
-                    return self.pos
-
-            # --- 2) Otherwise, probabilistic shot if stench and high risk ---
-            if percepts.get("stench", False):
-                targets = [(self.knowledge[i][j]["p_wumpus"], i, j)
-                           for i, j in self.neighbors(*self.pos)
-                           if not self.knowledge[i][j]["visited"]]
-
-                if targets:
-                    p, ti, tj = max(targets)
-                    if p > 0.65:
-                        self.action = "SHOOT ARROW"
-                        self.arrows -= 1
-                        killed = self.shoot_arrow(ti, tj)
-                        if killed:
-                            self.update_beliefs_after_shot(killed)
-                        return self.pos
+            shot = self.plan_shot()
+            if shot:
+                di, dj = shot
+                self.action = "SHOOT ARROW"
+                self.arrows -= 1
+                killed = self.shoot_arrow(self.pos[0] + di, self.pos[1] + dj)
+                self.update_beliefs_after_shot(killed, shot)
+                return self.pos
 
         # RETURN
         if self.returning:
@@ -584,6 +1069,15 @@ class Agent:
             self.path.append(self.pos)
             return self.pos
         
+        # PLAN
+        if self.planner == "expectimax":
+            move = self.plan_move()
+            if move:
+                self.mode = "PLAN"
+                self.pos = move
+                self.path.append(self.pos)
+                return self.pos
+
         # FRONTIER
         best = self.choose_frontier()
         if best:
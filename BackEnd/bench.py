@@ -0,0 +1,242 @@
+"""Seeded batch runs comparing agent planners.
+
+    python bench.py --size 5 --seeds 200 --planners cascade expectimax
+    python bench.py --size 7 --pit-prob 0.35 --wumpus-prob 0.1 \
+        --planners expectimax --plan-budgets 0.002 0.05 0.5
+    python bench.py --seeds 1000 --workers 4
+
+Worlds come from a port of createWorld in FrontEnd/src/world/world.ts, so
+the numbers match what the UI generates with the same config.
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from collections import deque
+from functools import partial
+from multiprocessing import Pool
+
+from agent import Agent, load_sat_backend
+
+# -----------------------------------
+# World generation (port of world.ts)
+# -----------------------------------
+
+DEFAULT_CONFIG = {"size": 8, "pitProb": 0.2, "pitWumpus": 0.08, "minGoldDistance": 2}
+
+SAFE_START_CELLS = {
+    (0, 0), (0, 1), (1, 0), (2, 0), (1, 1),
+    (0, 2), (0, 3), (1, 2), (2, 1), (3, 0),
+}
+
+
+def neighbors(i, j, size):
+    for ni, nj in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]:
+        if 0 <= ni < size and 0 <= nj < size:
+            yield ni, nj
+
+
+def diagonals(i, j, size):
+    for ni, nj in [(i - 1, j - 1), (i - 1, j + 1), (i + 1, j - 1), (i + 1, j + 1)]:
+        if 0 <= ni < size and 0 <= nj < size:
+            yield ni, nj
+
+
+def any_adjacent(world, i, j, size, types):
+    return any(
+        world[ni][nj] in types
+        for ni, nj in [*neighbors(i, j, size), *diagonals(i, j, size)]
+    )
+
+
+def bfs(world, size, start=(0, 0)):
+    dist = {start: 0}
+    queue = deque([start])
+
+    while queue:
+        i, j = queue.popleft()
+        for n in neighbors(i, j, size):
+            if n not in dist and world[n[0]][n[1]] not in ("pit", "wumpus"):
+                dist[n] = dist[(i, j)] + 1
+                queue.append(n)
+
+    return dist
+
+
+def create_world(config, rng):
+    size = config["size"]
+    desired_wumpus = max(1, int(size * size * config["pitWumpus"]))
+
+    while True:
+        world = [["empty"] * size for _ in range(size)]
+        safe_cells = SAFE_START_CELLS | set(neighbors(0, 0, size))
+
+        for i in range(size):
+            for j in range(size):
+                if (i, j) in safe_cells:
+                    continue
+                if rng.random() >= config["pitProb"]:
+                    continue
+                if any_adjacent(world, i, j, size, ("pit",)):
+                    continue
+                world[i][j] = "pit"
+
+        dist = bfs(world, size)
+        gold_candidates = [
+            (i, j) for (i, j), d in dist.items()
+            if world[i][j] == "empty"
+            and (i, j) not in SAFE_START_CELLS
+            and d >= config["minGoldDistance"]
+        ]
+        if not gold_candidates:
+            continue
+
+        gi, gj = gold_candidates[int(rng.random() * len(gold_candidates))]
+        world[gi][gj] = "gold"
+
+        # wumpuses guard the gold first
+        near_target = min(desired_wumpus, max(1, int(desired_wumpus * 0.8)))
+        near = sorted(
+            (d, (i, j)) for (i, j), d in bfs(world, size, (gi, gj)).items()
+            if world[i][j] == "empty"
+            and (i, j) not in SAFE_START_CELLS
+            and 0 < d <= 2
+        )
+
+        placed = 0
+        for _, (i, j) in near:
+            if placed >= near_target:
+                break
+            if any_adjacent(world, i, j, size, ("wumpus",)):
+                continue
+            world[i][j] = "wumpus"
+            placed += 1
+
+        rest = [
+            (i, j) for (i, j) in bfs(world, size)
+            if world[i][j] == "empty" and (i, j) not in SAFE_START_CELLS
+        ]
+        rng.shuffle(rest)
+
+        for i, j in rest:
+            if placed >= desired_wumpus:
+                break
+            if any_adjacent(world, i, j, size, ("wumpus",)):
+                continue
+            world[i][j] = "wumpus"
+            placed += 1
+
+        if placed != desired_wumpus:
+            continue
+
+        arrows = 0
+        rng.shuffle(rest)
+
+        for i, j in rest:
+            if arrows >= placed:
+                break
+            if world[i][j] != "empty":
+                continue
+            if any_adjacent(world, i, j, size, ("pit", "wumpus", "arrow")):
+                continue
+            world[i][j] = "arrow"
+            arrows += 1
+
+        if arrows != placed:
+            continue
+
+        return world
+
+# -----------------------------------
+# Batch runs
+# -----------------------------------
+
+def run_episode(world, **agent_kwargs):
+    agent = Agent(world, **agent_kwargs)
+
+    # the agent logs every step to stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        while agent.alive and not (agent.gold_found and agent.pos == (0, 0)):
+            agent.next_move()
+
+    return agent
+
+
+def run_seed(seed, planner, config, plan_budget):
+    world = create_world(config, random.Random(seed))
+    agent = run_episode(world, planner=planner, plan_budget=plan_budget)
+    return agent.alive, agent.death_cause, agent.steps
+
+
+def run_batch(planner, config, seeds, plan_budget, workers=1):
+    wins = deaths = timeouts = steps = 0
+    start = time.perf_counter()
+    job = partial(run_seed, planner=planner, config=config, plan_budget=plan_budget)
+
+    if workers > 1:
+        # workers import pysat once up front instead of on their first seed
+        with Pool(workers, initializer=load_sat_backend) as pool:
+            results = pool.map(job, range(seeds))
+    else:
+        results = map(job, range(seeds))
+
+    for alive, death_cause, agent_steps in results:
+        if alive:
+            wins += 1
+            steps += agent_steps
+        elif death_cause:
+            deaths += 1
+        else:
+            timeouts += 1
+
+    return {
+        "planner": planner,
+        "plan_budget": plan_budget,
+        "wins": wins,
+        "deaths": deaths,
+        "timeouts": timeouts,
+        "avg_win_steps": steps / wins if wins else 0.0,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--seeds", type=int, default=200)
+    parser.add_argument("--pit-prob", type=float, default=DEFAULT_CONFIG["pitProb"])
+    parser.add_argument("--wumpus-prob", type=float, default=DEFAULT_CONFIG["pitWumpus"])
+    parser.add_argument("--plan-budgets", type=float, nargs="+", default=[0.05],
+                        help="seconds per expectimax decision, one batch each")
+    parser.add_argument("--planners", nargs="+", default=["cascade", "expectimax"])
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to spread seeds over; plan budgets are "
+                             "wall-clock, so keep this at or below the core count")
+    args = parser.parse_args()
+
+    config = dict(
+        DEFAULT_CONFIG,
+        size=args.size,
+        pitProb=args.pit_prob,
+        pitWumpus=args.wumpus_prob,
+    )
+
+    runs = []
+    for planner in args.planners:
+        # the budget only matters to the planner that searches
+        budgets = args.plan_budgets if planner == "expectimax" else args.plan_budgets[:1]
+        runs.extend((planner, budget) for budget in budgets)
+
+    for planner, budget in runs:
+        r = run_batch(planner, config, args.seeds, budget, args.workers)
+        label = f"{planner} {budget:g}s" if planner == "expectimax" else planner
+        print(
+            f"{label:<18} wins {r['wins']:>4}  deaths {r['deaths']:>4}  "
+            f"timeouts {r['timeouts']:>4}  avg win steps {r['avg_win_steps']:.1f}  "
+            f"{r['seconds']:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
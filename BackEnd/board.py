@@ -0,0 +1,176 @@
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+# -----------------------------------
+# Cell encoding
+# -----------------------------------
+
+CELL_TYPES = ("empty", "pit", "wumpus", "gold", "arrow")
+CELL_CODES = {name: code for code, name in enumerate(CELL_TYPES)}
+
+# knowledge flags (low nibble) + percepts (high nibble), one byte per cell
+VISITED = 1 << 0
+SAFE = 1 << 1
+CONFIRMED_PIT = 1 << 2
+CONFIRMED_WUMPUS = 1 << 3
+
+BREEZE = 1 << 4
+STENCH = 1 << 5
+GLITTER = 1 << 6
+ARROW = 1 << 7
+
+FLAG_BITS = (
+    ("visited", VISITED),
+    ("safe", SAFE),
+    ("confirmed_pit", CONFIRMED_PIT),
+    ("confirmed_wumpus", CONFIRMED_WUMPUS),
+)
+
+PERCEPT_BITS = (
+    ("breeze", BREEZE),
+    ("stench", STENCH),
+    ("glitter", GLITTER),
+    ("arrow", ARROW),
+)
+
+# planes laid out back to back, size * size bytes each
+PLANES = ("world", "flags", "p_pit", "p_wumpus")
+
+
+def quantize(p):
+    return int(round(p * 255))
+
+
+def dequantize(q):
+    return round(q / 255, 3)
+
+
+def encode_world(world):
+    return bytes(CELL_CODES[v] for row in world for v in row)
+
+
+def encode_knowledge(knowledge):
+    """Pack a knowledge grid into (flags, p_pit, p_wumpus) uint8 planes."""
+    cells = sum(len(row) for row in knowledge)
+    flags = bytearray(cells)
+    p_pit = bytearray(cells)
+    p_wumpus = bytearray(cells)
+
+    k = 0
+    for row in knowledge:
+        for c in row:
+            bits = 0
+            for key, bit in FLAG_BITS:
+                if c[key]:
+                    bits |= bit
+            percepts = c["percepts"]
+            for key, bit in PERCEPT_BITS:
+                if percepts.get(key):
+                    bits |= bit
+
+            flags[k] = bits
+            p_pit[k] = quantize(c["p_pit"])
+            p_wumpus[k] = quantize(c["p_wumpus"])
+            k += 1
+
+    return flags, p_pit, p_wumpus
+
+
+class SharedBoard:
+    """World and knowledge grids packed into one shared memory block.
+
+    Every cell takes one byte per plane: the world cell code, the knowledge
+    flags with percepts in the high nibble, and p_pit / p_wumpus quantized
+    to 0..255. Other processes attach by ``name`` and read without copying.
+    """
+
+    def __init__(self, size, name=None):
+        self.size = size
+        self.cells = size * size
+
+        nbytes = self.cells * len(PLANES)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            # readers must not unlink the block when they exit (bpo-39959)
+            if sys.version_info >= (3, 13):
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                self.shm = shared_memory.SharedMemory(name=name)
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            self.owner = False
+
+        buf = self.shm.buf
+        for k, plane in enumerate(PLANES):
+            setattr(self, plane, buf[k * self.cells:(k + 1) * self.cells])
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name, size):
+        return cls(size, name=name)
+
+    def close(self):
+        for plane in PLANES:
+            getattr(self, plane).release()
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # --------------------------------------------------
+    # WRITE
+    # --------------------------------------------------
+
+    def write_cell(self, i, j, value):
+        self.world[i * self.size + j] = CELL_CODES[value]
+
+    def write_world(self, world):
+        self.world[:] = encode_world(world)
+
+    def write_knowledge(self, knowledge):
+        flags, p_pit, p_wumpus = encode_knowledge(knowledge)
+        self.flags[:] = flags
+        self.p_pit[:] = p_pit
+        self.p_wumpus[:] = p_wumpus
+
+    # --------------------------------------------------
+    # READ
+    # --------------------------------------------------
+
+    def cell(self, i, j):
+        return CELL_TYPES[self.world[i * self.size + j]]
+
+    def read_world(self):
+        n = self.size
+        return [
+            [CELL_TYPES[code] for code in self.world[i * n:(i + 1) * n]]
+            for i in range(n)
+        ]
+
+    def read_knowledge(self):
+        n = self.size
+        out = []
+
+        for i in range(n):
+            row = []
+            for j in range(n):
+                k = i * n + j
+                bits = self.flags[k]
+                c = {key: bool(bits & bit) for key, bit in FLAG_BITS}
+                # percepts are only known once the cell was visited
+                c["percepts"] = (
+                    {key: bool(bits & bit) for key, bit in PERCEPT_BITS}
+                    if bits & VISITED else {}
+                )
+                c["p_pit"] = dequantize(self.p_pit[k])
+                c["p_wumpus"] = dequantize(self.p_wumpus[k])
+                row.append(c)
+            out.append(row)
+
+        return out
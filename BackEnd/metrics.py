@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+
+# -----------------------------------
+# Payload size estimate
+# -----------------------------------
+
+def payload_size(obj):
+    """Rough wire size of an emit payload without encoding it twice."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj) + 2
+    if isinstance(obj, dict):
+        return 2 + sum(len(k) + 3 + payload_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return 2 + sum(payload_size(v) + 1 for v in obj)
+    if obj is None:
+        return 4
+    return len(str(obj))
+
+
+class Metrics:
+    """Server throughput and latency counters, rendered in Prometheus text.
+
+    Everything here is process-wide: all sessions share one latency
+    window, one step rate and one history, like the server's single agent.
+    """
+
+    def __init__(self, window=2048, rate_window=10.0):
+        self.started = time.monotonic()
+        self.sessions = set()
+
+        self.rate_window = rate_window
+        # pruned by age, not length, so bursts don't drop stamps still in the window
+        self.step_stamps = deque()
+        self.step_latency = deque(maxlen=window)
+        self.steps_total = 0
+        self.step_seconds_total = 0.0
+
+        self.emits_total = 0
+        self.emit_bytes_total = 0
+
+        # pickled size of each history snapshot, measured when it is taken
+        self.history_sizes = []
+
+        self.loop_lag = 0.0
+        self.loop_watcher = None
+
+    # --------------------------------------------------
+    # RECORDING
+    # --------------------------------------------------
+
+    def connect(self, sid):
+        self.sessions.add(sid)
+
+    def disconnect(self, sid):
+        self.sessions.discard(sid)
+
+    def record_step(self, seconds):
+        self.steps_total += 1
+        self.step_seconds_total += seconds
+        now = time.monotonic()
+        self.step_stamps.append(now)
+        self.prune_stamps(now)
+        self.step_latency.append(seconds)
+
+    def record_emit(self, payload):
+        self.emits_total += 1
+        self.emit_bytes_total += payload_size(payload)
+
+    def record_snapshot(self, nbytes):
+        self.history_sizes.append(nbytes)
+
+    def drop_snapshot(self):
+        if self.history_sizes:
+            self.history_sizes.pop()
+
+    def reset_history(self):
+        self.history_sizes = []
+
+    def start_loop_watcher(self):
+        # keep the handle, the loop only holds a weak reference to tasks
+        self.loop_watcher = asyncio.create_task(self.watch_event_loop())
+
+    def stop_loop_watcher(self):
+        if self.loop_watcher is not None:
+            self.loop_watcher.cancel()
+            self.loop_watcher = None
+
+    async def watch_event_loop(self, interval=0.5):
+        """Track how late the loop wakes us up compared to the requested sleep."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(interval)
+            self.loop_lag = max(0.0, time.monotonic() - start - interval)
+
+    # --------------------------------------------------
+    # READING
+    # --------------------------------------------------
+
+    def prune_stamps(self, now):
+        cutoff = now - self.rate_window
+        while self.step_stamps and self.step_stamps[0] < cutoff:
+            self.step_stamps.popleft()
+
+    def steps_per_second(self):
+        self.prune_stamps(time.monotonic())
+        return len(self.step_stamps) / self.rate_window
+
+    def latency_quantile(self, q):
+        if not self.step_latency:
+            return 0.0
+        ordered = sorted(self.step_latency)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self):
+        return {
+            "uptime_seconds": time.monotonic() - self.started,
+            "active_sessions": len(self.sessions),
+            "steps_total": self.steps_total,
+            "steps_per_second": self.steps_per_second(),
+            "next_move_latency_p50_seconds": self.latency_quantile(0.5),
+            "next_move_latency_p99_seconds": self.latency_quantile(0.99),
+            "emits_total": self.emits_total,
+            "emit_bytes_total": self.emit_bytes_total,
+            "history_snapshots": len(self.history_sizes),
+            "history_bytes": sum(self.history_sizes),
+            "event_loop_lag_seconds": self.loop_lag,
+        }
+
+    def render(self):
+        s = self.snapshot()
+        lines = [
+            ("wumpus_uptime_seconds", "gauge", s["uptime_seconds"]),
+            ("wumpus_active_sessions", "gauge", s["active_sessions"]),
+            ("wumpus_steps_total", "counter", s["steps_total"]),
+            ("wumpus_steps_per_second", "gauge", s["steps_per_second"]),
+            ("wumpus_emits_total", "counter", s["emits_total"]),
+            ("wumpus_emit_bytes_total", "counter", s["emit_bytes_total"]),
+            ("wumpus_history_snapshots", "gauge", s["history_snapshots"]),
+            ("wumpus_history_bytes", "gauge", s["history_bytes"]),
+            ("wumpus_event_loop_lag_seconds", "gauge", s["event_loop_lag_seconds"]),
+        ]
+
+        out = []
+        for name, kind, value in lines:
+            out.append(f"# TYPE {name} {kind}")
+            out.append(f"{name} {value}")
+
+        out.append("# TYPE wumpus_next_move_latency_seconds summary")
+        out.append(f'wumpus_next_move_latency_seconds{{quantile="0.5"}} {s["next_move_latency_p50_seconds"]}')
+        out.append(f'wumpus_next_move_latency_seconds{{quantile="0.99"}} {s["next_move_latency_p99_seconds"]}')
+        out.append(f"wumpus_next_move_latency_seconds_sum {self.step_seconds_total}")
+        out.append(f"wumpus_next_move_latency_seconds_count {self.steps_total}")
+
+        return "\n".join(out) + "\n"
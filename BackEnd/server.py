@@ -1,10 +1,79 @@
 import socketio
 import asyncio
-from agent import Agent
-import copy
+import time
+from agent import Agent, load_sat_backend
+from board import SharedBoard, encode_world, encode_knowledge
+from metrics import Metrics
+import pickle
 
 def snapshot_agent(agent):
-    return copy.deepcopy(agent)
+    # the shared board is live state, keep it out of history snapshots
+    board, agent.board = agent.board, None
+    # a pickle round trip copies the agent and tells us its size for free
+    data = pickle.dumps(agent, pickle.HIGHEST_PROTOCOL)
+    agent.board = board
+    server_metrics.record_snapshot(len(data))
+    return pickle.loads(data)
+
+def run_step(agent):
+    start = time.perf_counter()
+    agent.next_move()
+    server_metrics.record_step(time.perf_counter() - start)
+
+async def emit(event, data, to=None):
+    server_metrics.record_emit(data)
+    await sio.emit(event, data, to=to)
+
+async def emit_agent(event, agent, to=None):
+    # each session gets the encoding it asked for, built once per encoding
+    targets = [to] if to is not None else list(sessions)
+    payloads = {}
+    agent.sync_board()
+
+    for sid in targets:
+        binary = sessions.get(sid, {}).get("binary", False)
+        if binary not in payloads:
+            payloads[binary] = serialize_agent(agent, binary=binary)
+        await emit(event, payloads[binary], to=sid)
+
+# -----------------------------------
+# Metrics
+# -----------------------------------
+
+server_metrics = Metrics()
+
+async def metrics_app(scope, receive, send):
+    # plain ASGI app behind Socket.IO, serves GET /metrics
+    if scope["type"] != "http":
+        return
+
+    if scope["path"] != "/metrics":
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    body = server_metrics.render().encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"text/plain; version=0.0.4")],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def startup():
+    # warm the solver while the server boots instead of on the first step
+    load_sat_backend()
+    server_metrics.start_loop_watcher()
+
+async def shutdown():
+    # unlink the shared block so it does not outlive the server
+    global board
+
+    server_metrics.stop_loop_watcher()
+
+    if board is not None:
+        board.close()
+        board = None
 
 # -----------------------------------
 # Socket.IO setup 
@@ -15,7 +84,12 @@ sio = socketio.AsyncServer(
     cors_allowed_origins="*" 
 )
 
-app = socketio.ASGIApp(sio)
+app = socketio.ASGIApp(
+    sio,
+    other_asgi_app=metrics_app,
+    on_startup=startup,
+    on_shutdown=shutdown,
+)
 
 # -----------------------------------
 # Global simulation state
@@ -23,8 +97,10 @@ app = socketio.ASGIApp(sio)
 
 world = None
 agent = None
+board = None
 running = False
 history = []
+sessions = {}
 
 # -----------------------------------
 # Socket events
@@ -33,28 +109,59 @@ history = []
 @sio.event
 async def connect(sid, environ):
     print("🟢 Connected:", sid)
-    await sio.emit("connected", {"msg": "ready"}, to=sid)
+    server_metrics.connect(sid)
+    sessions[sid] = {"binary": False}
+    await emit("connected", {"msg": "ready"}, to=sid)
 
 @sio.event
 async def disconnect(sid):
     print("🔴 Disconnected:", sid)
+    server_metrics.disconnect(sid)
+    sessions.pop(sid, None)
+
+@sio.on("metrics")
+async def send_metrics(sid):
+    await emit("metrics", server_metrics.snapshot(), to=sid)
 
 # -------- RECEIVE WORLD FROM FRONTEND --------
 
 @sio.event
 async def init_world(sid, data):
-    global world, agent, running, history
+    global world, agent, board, running, history
 
-    world = data["world"]
     arrows = data.get("arrows", 0)
+    planner = data.get("planner", "cascade")
+    plan_budget = data.get("plan_budget", 0.05)
+
+    try:
+        new_agent = Agent(
+            data["world"],
+            arrows=arrows,
+            planner=planner,
+            plan_budget=plan_budget,
+        )
+    except ValueError as e:
+        print("⚠️ Rejected world:", e)
+        await emit("init_error", {"msg": str(e)}, to=sid)
+        return
+
+    # opt-in packed grids for this session, see serialize_agent_binary
+    sessions.setdefault(sid, {})["binary"] = bool(data.get("binary", False))
+
+    if board is not None:
+        board.close()
+    board = SharedBoard(len(data["world"]))
 
-    agent = Agent(world, arrows=arrows)
+    world = data["world"]
+    agent = new_agent
+    agent.attach_board(board)
     history = []
+    server_metrics.reset_history()
     running = False
 
     print("🌍 World initialized")
 
-    await sio.emit("world_ready", serialize_agent(agent), to=sid)
+    await emit_agent("world_ready", agent, to=sid)
 
 # -------- STEP-BY-STEP MODE --------
 
@@ -66,9 +173,9 @@ async def step(sid):
         return
 
     history.append(snapshot_agent(agent))
-    agent.next_move()
+    run_step(agent)
     
-    await sio.emit("agent_update", serialize_agent(agent), to=sid)
+    await emit_agent("agent_update", agent, to=sid)
 
 # -------- AUTO-RUN MODE --------
 
@@ -94,8 +201,10 @@ async def previous(sid):
     if not history:
         return
 
-    agent = history.pop()   
-    await sio.emit("agent_update", serialize_agent(agent), to=sid)
+    agent = history.pop()
+    server_metrics.drop_snapshot()
+    agent.attach_board(board)
+    await emit_agent("agent_update", agent, to=sid)
 
 # -----------------------------------
 # Simulation loop
@@ -106,9 +215,9 @@ async def simulation_loop():
 
     while running and agent and agent.alive:
         history.append(snapshot_agent(agent))
-        agent.next_move()
+        run_step(agent)
         
-        await sio.emit("agent_update", serialize_agent(agent))
+        await emit_agent("agent_update", agent)
 
         if agent.gold_found and agent.pos == (0, 0):
             print("🏆 Agent returned home with gold")
@@ -119,7 +228,7 @@ async def simulation_loop():
     running = False
 
     if agent:
-        await sio.emit("simulation_end", {
+        await emit("simulation_end", {
             "alive": agent.alive,
             "gold_found": agent.gold_found,
             "returned_home": agent.pos == (0, 0) and agent.gold_found,
@@ -135,9 +244,8 @@ async def simulation_loop():
 # Serialization
 # -----------------------------------
 
-def serialize_agent(agent: Agent):
+def agent_fields(agent: Agent):
     return {
-        "world": agent.world,
         "size": agent.size,
         "pos": list(agent.pos),
         "path": [list(p) for p in agent.path],
@@ -156,6 +264,16 @@ def serialize_agent(agent: Agent):
         "killed_wumpus_positions": [list(p) for p in agent.killed_wumpus_positions],
         "wumpus_kill_count": agent.wumpus_kill_count,
         "total_arrows_collected": agent.total_arrows_collected,
+    }
+
+def serialize_agent(agent: Agent, binary=False):
+    if binary:
+        return serialize_agent_binary(agent)
+
+    # the board is quantized, JSON stays exact and reads the agent directly
+    return {
+        "world": agent.world,
+        **agent_fields(agent),
 
         "knowledge": [
             [
@@ -173,3 +291,32 @@ def serialize_agent(agent: Agent):
             for row in agent.knowledge
         ]
     }
+
+def serialize_agent_binary(agent: Agent):
+    """Grids as row-major uint8 planes, sent as Socket.IO binary attachments.
+
+    world holds cell codes (board.CELL_TYPES), flags packs the knowledge
+    bits with percepts in the high nibble, p_pit / p_wumpus are quantized
+    to 0..255.
+    """
+    if agent.board is not None:
+        agent.sync_board()
+        world = bytes(agent.board.world)
+        flags = bytes(agent.board.flags)
+        p_pit = bytes(agent.board.p_pit)
+        p_wumpus = bytes(agent.board.p_wumpus)
+    else:
+        world = encode_world(agent.world)
+        flags, p_pit, p_wumpus = (bytes(p) for p in encode_knowledge(agent.knowledge))
+
+    return {
+        "encoding": "binary",
+        "world": world,
+        **agent_fields(agent),
+
+        "knowledge": {
+            "flags": flags,
+            "p_pit": p_pit,
+            "p_wumpus": p_wumpus,
+        }
+    }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the backend is a flat set of modules run from BackEnd/, not a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
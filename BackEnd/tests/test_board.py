@@ -0,0 +1,221 @@
+import json
+import os
+import subprocess
+import sys
+
+from agent import Agent
+from board import SharedBoard, encode_knowledge, encode_world
+from server import serialize_agent
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "FrontEnd", "src", "world", "__fixtures__", "binary_payload.json",
+)
+
+WORLD = [
+    ["empty", "empty", "pit", "empty"],
+    ["empty", "wumpus", "empty", "arrow"],
+    ["empty", "empty", "empty", "pit"],
+    ["gold", "empty", "pit", "empty"],
+]
+
+
+def sample_agent(world=WORLD):
+    agent = Agent([row[:] for row in world], arrows=1)
+    kb = agent.knowledge
+
+    for i, j in [(0, 0), (0, 1), (1, 0)]:
+        kb[i][j]["visited"] = True
+        kb[i][j]["safe"] = True
+        kb[i][j]["percepts"] = agent.get_percepts(i, j)
+
+    kb[1][1]["confirmed_wumpus"] = True
+    kb[1][1]["p_wumpus"] = 1.0
+    kb[0][2]["p_pit"] = 0.32
+    kb[2][0]["safe"] = True
+    kb[1][2]["p_pit"] = 0.2
+    kb[1][2]["p_wumpus"] = 0.51
+    return agent
+
+
+def binary_payload(agent):
+    payload = serialize_agent(agent, binary=True)
+    # bytes are sent as attachments; spell them out as lists for the fixture
+    payload["world"] = list(payload["world"])
+    payload["knowledge"] = {k: list(v) for k, v in payload["knowledge"].items()}
+    return payload
+
+
+def decoded_grids(agent):
+    """What decodeAgentState should hand back for this agent."""
+    knowledge = [
+        [
+            {
+                "visited": c["visited"],
+                "safe": c["safe"],
+                "confirmed_pit": c["confirmed_pit"],
+                "confirmed_wumpus": c["confirmed_wumpus"],
+                "percepts": {
+                    key: bool(c["percepts"].get(key))
+                    for key in ("breeze", "stench", "glitter", "arrow")
+                } if c["visited"] else {},
+                "p_pit": round(c["p_pit"] * 255) / 255,
+                "p_wumpus": round(c["p_wumpus"] * 255) / 255,
+            }
+            for c in row
+        ]
+        for row in agent.knowledge
+    ]
+    return {"world": agent.world, "knowledge": knowledge}
+
+
+def write_fixture():
+    agent = sample_agent()
+    with open(FIXTURE, "w") as f:
+        json.dump(
+            {"payload": binary_payload(agent), "expected": decoded_grids(agent)},
+            f,
+        )
+        f.write("\n")
+
+
+# -----------------------------------
+# Round trip
+# -----------------------------------
+
+def test_fixture_matches_encoder():
+    # FrontEnd/src/world/binary.test.ts decodes the same fixture; rerun
+    # `PYTHONPATH=. python tests/test_board.py` from BackEnd/ after an
+    # encoding change to regenerate it
+    with open(FIXTURE) as f:
+        fixture = json.load(f)
+
+    agent = sample_agent()
+    assert fixture["payload"] == binary_payload(agent)
+    assert fixture["expected"] == decoded_grids(agent)
+
+
+def test_shared_board_round_trip():
+    agent = sample_agent()
+    board = SharedBoard(agent.size)
+    try:
+        agent.attach_board(board)
+        assert board.read_world() == agent.world
+
+        other = SharedBoard.attach(board.name, agent.size)
+        try:
+            assert other.cell(1, 1) == "wumpus"
+            knowledge = other.read_knowledge()
+        finally:
+            other.close()
+
+        assert knowledge[0][1]["percepts"] == agent.knowledge[0][1]["percepts"]
+        assert knowledge[3][3]["percepts"] == {}
+        assert knowledge[1][2]["p_wumpus"] == round(0.51 * 255 / 255, 3)
+
+        agent.set_tile(3, 0, "empty")
+        assert board.cell(3, 0) == "empty"
+    finally:
+        board.close()
+
+
+def test_board_knowledge_syncs_on_demand():
+    agent = sample_agent()
+    board = SharedBoard(agent.size)
+    try:
+        agent.attach_board(board)
+        agent.knowledge[2][2]["confirmed_pit"] = True
+        agent.update_probabilities()
+        assert agent.board_dirty
+        assert board.read_knowledge()[2][2]["confirmed_pit"] is False
+
+        agent.sync_board()
+        assert not agent.board_dirty
+        flags, p_pit, p_wumpus = encode_knowledge(agent.knowledge)
+        assert bytes(board.p_pit) == bytes(p_pit)
+        assert bytes(board.flags) == bytes(flags)
+    finally:
+        board.close()
+
+
+def test_reader_process_does_not_unlink_board():
+    # a reader exiting used to take the block down with its resource tracker
+    agent = sample_agent()
+    board = SharedBoard(agent.size)
+    try:
+        agent.attach_board(board)
+        reader = (
+            "import sys; from board import SharedBoard; "
+            "b = SharedBoard.attach(sys.argv[1], int(sys.argv[2])); "
+            "print(b.cell(1, 1)); b.close()"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", reader, board.name, str(agent.size)],
+            cwd=os.path.dirname(os.path.dirname(__file__)),
+            capture_output=True, text=True, check=True,
+        )
+        assert out.stdout.strip() == "wumpus"
+        assert "leaked" not in out.stderr
+
+        other = SharedBoard.attach(board.name, agent.size)
+        assert other.cell(1, 1) == "wumpus"
+        other.close()
+    finally:
+        board.close()
+
+
+def test_close_tolerates_unlinked_board():
+    board = SharedBoard(4)
+    board.shm.unlink()
+    board.close()
+
+
+def test_encode_matches_board_planes():
+    agent = sample_agent()
+    flags, p_pit, p_wumpus = encode_knowledge(agent.knowledge)
+    payload = serialize_agent(agent, binary=True)
+
+    assert payload["world"] == encode_world(agent.world)
+    assert payload["knowledge"] == {
+        "flags": bytes(flags),
+        "p_pit": bytes(p_pit),
+        "p_wumpus": bytes(p_wumpus),
+    }
+
+
+# -----------------------------------
+# Payload size
+# -----------------------------------
+
+def wire_size(payload):
+    # JSON for the plain fields plus raw attachment bytes, as Socket.IO sends it
+    attachments = 0
+
+    def strip(obj):
+        nonlocal attachments
+        if isinstance(obj, bytes):
+            attachments += len(obj)
+            return {"_placeholder": True, "num": 0}
+        if isinstance(obj, dict):
+            return {k: strip(v) for k, v in obj.items()}
+        return obj
+
+    return len(json.dumps(strip(payload))) + attachments
+
+
+def test_binary_knowledge_is_much_smaller():
+    size = 16
+    agent = sample_agent([["empty"] * size for _ in range(size)])
+    for row in agent.knowledge:
+        for c in row:
+            c["visited"] = True
+            c["percepts"] = {"breeze": True, "stench": False, "glitter": False, "arrow": False}
+            c["p_pit"] = 0.32
+
+    as_json = len(json.dumps(serialize_agent(agent)["knowledge"]))
+    as_binary = wire_size({"knowledge": serialize_agent(agent, binary=True)["knowledge"]})
+    assert as_json >= 20 * as_binary
+
+
+if __name__ == "__main__":
+    write_fixture()
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(__file__))
+
+
+def imports_pysat(module):
+    code = f"import sys, {module}; print('pysat' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    )
+    return out.stdout.strip() == "True"
+
+
+@pytest.mark.parametrize("module", ["agent", "board", "bench"])
+def test_import_does_not_load_the_sat_backend(module):
+    assert not imports_pysat(module)
+
+
+def test_server_import_does_not_load_the_sat_backend():
+    pytest.importorskip("socketio")
+    # startup() loads it, importing the module must not
+    assert not imports_pysat("server")
@@ -0,0 +1,67 @@
+import asyncio
+
+from metrics import Metrics, payload_size
+
+
+def test_render_has_summary_sum_and_count():
+    m = Metrics()
+    m.record_step(0.01)
+    m.record_step(0.03)
+
+    text = m.render()
+    assert "wumpus_next_move_latency_seconds_count 2" in text
+    assert "wumpus_next_move_latency_seconds_sum 0.04" in text
+    assert 'wumpus_next_move_latency_seconds{quantile="0.99"} 0.03' in text
+
+
+def test_step_rate_keeps_every_stamp_in_the_window():
+    m = Metrics(window=16, rate_window=10.0)
+    for _ in range(5000):
+        m.record_step(0.0001)
+
+    assert m.steps_per_second() == 500.0
+    assert len(m.step_latency) == 16
+
+
+def test_step_rate_forgets_old_steps(monkeypatch):
+    m = Metrics(rate_window=10.0)
+    now = [100.0]
+    monkeypatch.setattr("metrics.time.monotonic", lambda: now[0])
+
+    m.record_step(0.01)
+    now[0] += 11
+    m.record_step(0.01)
+
+    assert m.steps_per_second() == 0.1
+    assert len(m.step_stamps) == 1
+
+
+def test_history_sizes_follow_push_and_pop():
+    m = Metrics()
+    m.record_snapshot(100)
+    m.record_snapshot(120)
+    m.drop_snapshot()
+
+    assert m.snapshot()["history_snapshots"] == 1
+    assert m.snapshot()["history_bytes"] == 100
+
+    m.reset_history()
+    assert m.snapshot()["history_bytes"] == 0
+
+
+def test_payload_size_counts_attachments_raw():
+    assert payload_size({"world": b"\x00" * 64}) == 2 + len("world") + 3 + 64
+
+
+def test_loop_watcher_handle_is_kept():
+    async def run():
+        m = Metrics()
+        m.start_loop_watcher()
+        task = m.loop_watcher
+        assert task is not None and not task.done()
+
+        m.stop_loop_watcher()
+        await asyncio.sleep(0)
+        assert task.cancelled() and m.loop_watcher is None
+
+    asyncio.run(run())
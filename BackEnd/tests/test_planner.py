@@ -0,0 +1,97 @@
+import pytest
+
+import agent as agent_module
+from agent import PIT_PRIOR, Agent
+from bench import run_episode
+
+WORLD = [
+    ["empty", "empty", "empty", "empty"],
+    ["empty", "empty", "empty", "pit"],
+    ["empty", "empty", "empty", "empty"],
+    ["empty", "wumpus", "empty", "gold"],
+]
+
+
+def planning_agent(**kwargs):
+    agent = Agent([row[:] for row in WORLD], planner="expectimax", **kwargs)
+    kb = agent.knowledge
+    kb[0][0]["visited"] = True
+    kb[0][0]["percepts"] = {"breeze": False, "stench": False}
+    kb[0][1]["safe"] = kb[1][0]["safe"] = True
+    return agent
+
+
+def test_unknown_cells_are_never_free():
+    agent = planning_agent()
+
+    assert agent.death_prob(3, 3) >= PIT_PRIOR
+    assert agent.death_prob(0, 1) == 0.0
+
+
+def test_posterior_uses_the_no_adjacent_hazards_rule():
+    agent = Agent([row[:] for row in WORLD], planner="expectimax")
+    kb = agent.knowledge
+    kb[0][0]["visited"] = True
+    kb[0][0]["percepts"] = {"breeze": True, "stench": False}
+
+    pits = agent.hazard_posterior("pit", float("inf"))
+    wumpuses = agent.hazard_posterior("wumpus", float("inf"))
+
+    # (0, 1) and (1, 0) touch diagonally, so exactly one of them is the pit
+    assert pits[0, 1] == pits[1, 0] == pytest.approx(0.5)
+    assert pits[3, 3] == PIT_PRIOR
+    assert wumpuses[0, 1] == wumpuses[1, 0] == 0.0
+
+
+def test_posterior_rejects_an_impossible_kb():
+    agent = Agent([row[:] for row in WORLD], planner="expectimax")
+    kb = agent.knowledge
+    kb[0][0]["visited"] = True
+    kb[0][0]["percepts"] = {"breeze": True}
+    kb[0][1]["safe"] = kb[1][0]["safe"] = True
+
+    assert agent.hazard_posterior("pit", float("inf")) is None
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"planner": "mcts"},
+    {"plan_budget": 0},
+    {"plan_budget": True},
+    {"plan_budget": "0.1"},
+])
+def test_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        Agent([row[:] for row in WORLD], **kwargs)
+
+
+def test_timeout_before_depth_one_does_not_disable_planning(monkeypatch):
+    agent = planning_agent()
+    agent.pos = (0, 1)
+    agent.knowledge[0][1]["visited"] = True
+
+    def expired(*args, **kwargs):
+        raise agent_module.PlanTimeout
+
+    monkeypatch.setattr(agent, "plan_value", expired)
+    assert agent.plan_move() is None
+    assert agent.plan_target is None
+
+    monkeypatch.undo()
+    assert agent.plan_move() in [(0, 2), (1, 1), (0, 0)]
+
+
+def test_known_safe_moves_come_first():
+    pytest.importorskip("pysat")
+
+    agent = Agent([row[:] for row in WORLD], planner="expectimax")
+    agent.next_move()
+
+    # (0, 0) has no percepts, both neighbours are entailed safe
+    assert agent.mode == "SAFE MOVE"
+
+
+def test_plays_a_full_episode():
+    pytest.importorskip("pysat")
+
+    agent = run_episode([row[:] for row in WORLD], planner="expectimax")
+    assert agent.alive and agent.gold_found and agent.pos == (0, 0)
@@ -0,0 +1,116 @@
+import copy
+
+import pytest
+
+from agent import Agent
+
+EMPTY = [["empty"] * 5 for _ in range(5)]
+
+
+def shooter(world=EMPTY, pos=(0, 0)):
+    agent = Agent([row[:] for row in world], arrows=1)
+    agent.pos = pos
+    agent.knowledge[pos[0]][pos[1]]["visited"] = True
+    return agent
+
+
+# -----------------------------------
+# Direction choice
+# -----------------------------------
+
+def test_confirmed_wumpus_anywhere_on_the_line():
+    agent = shooter(pos=(2, 0))
+    agent.knowledge[2][3]["confirmed_wumpus"] = True
+
+    assert agent.plan_shot() == (0, 1)
+
+
+def test_weak_scores_do_not_add_up_to_a_shot():
+    agent = shooter()
+    for j in (1, 2, 3):
+        agent.knowledge[0][j]["p_wumpus"] = 0.32
+
+    assert agent.plan_shot() is None
+
+
+def test_strong_cell_far_down_the_line():
+    agent = shooter()
+    agent.knowledge[3][0]["p_wumpus"] = 0.7
+
+    assert agent.plan_shot() == (1, 0)
+
+
+def test_more_candidates_break_ties():
+    agent = shooter(pos=(2, 2))
+    agent.knowledge[0][2]["p_wumpus"] = 0.7
+    agent.knowledge[2][4]["p_wumpus"] = 0.7
+    agent.knowledge[2][3]["p_wumpus"] = 0.3
+
+    assert agent.plan_shot() == (0, 1)
+
+
+def test_cleared_cells_are_skipped():
+    agent = shooter()
+    agent.knowledge[0][2]["p_wumpus"] = 0.7
+    agent.no_wumpus.add((0, 2))
+
+    assert agent.plan_shot() is None
+
+
+# -----------------------------------
+# Folding outcomes into the KB
+# -----------------------------------
+
+def test_miss_clears_the_whole_line():
+    pytest.importorskip("pysat")
+
+    agent = shooter()
+    killed = agent.shoot_arrow(0, 1)
+    agent.update_beliefs_after_shot(killed, (0, 1))
+
+    assert killed == []
+    assert agent.no_wumpus == {(0, 1), (0, 2), (0, 3), (0, 4)}
+    assert all(agent.knowledge[0][j]["p_wumpus"] == 0.0 for j in range(5))
+
+
+def test_kill_clears_cells_before_the_wumpus():
+    pytest.importorskip("pysat")
+
+    world = [row[:] for row in EMPTY]
+    world[0][3] = "wumpus"
+    agent = shooter(world)
+    agent.knowledge[0][0]["percepts"] = agent.get_percepts(0, 0)
+
+    killed = agent.shoot_arrow(0, 1)
+    agent.update_beliefs_after_shot(killed, (0, 1))
+
+    assert killed == [(0, 3)]
+    assert agent.no_wumpus == {(0, 1), (0, 2)}
+    assert agent.knowledge[0][3]["visited"] and agent.knowledge[0][3]["safe"]
+    assert agent.world[0][3] == "empty"
+
+
+def test_incremental_update_matches_full_rebuild():
+    pytest.importorskip("pysat")
+
+    world = [
+        ["empty", "empty", "empty", "empty", "empty"],
+        ["empty", "empty", "empty", "wumpus", "empty"],
+        ["empty", "empty", "empty", "empty", "pit"],
+        ["empty", "wumpus", "empty", "empty", "empty"],
+        ["empty", "empty", "empty", "empty", "gold"],
+    ]
+    agent = Agent(world, arrows=1)
+    for pos in [(0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (2, 1), (1, 0)]:
+        agent.pos = pos
+        agent.update_knowledge(agent.get_percepts(*pos))
+
+    agent.pos = (1, 1)
+    killed = agent.shoot_arrow(1, 2)
+    agent.update_beliefs_after_shot(killed, (0, 1))
+
+    full = copy.deepcopy(agent)
+    full.rebuild_beliefs()
+
+    assert killed == [(1, 3)]
+    assert agent.knowledge == full.knowledge
@@ -15,6 +15,7 @@ import { useAppDispatch, useAppSelector } from "@/redux/hooks";
 import { setConfig } from "@/redux/slice/configSlice";
 import { io } from "socket.io-client";
 import { addData } from "@/redux/slice/resultSlice";
+import { decodeAgentState } from "@/world/binary";
 
 const images: Record<Cell, string | null> = {
   empty: null,
@@ -55,14 +56,16 @@ export default function WumpusBoard() {
       console.log("✅ Server:", msg);
     });
 
-    socket.on("world_ready", (data) => {
+    socket.on("world_ready", (payload) => {
+      const data = decodeAgentState(payload);
       console.log("🌍 world_ready", data);
       setWorld(data.world); // server is now source of truth
       setAgent(data);
     });
 
     // receive agent updates while running
-    socket.on("agent_update", (data) => {
+    socket.on("agent_update", (payload) => {
+      const data = decodeAgentState(payload);
       setResult(null);
       setWorld(data.world);
       setAgent(data);
@@ -92,7 +95,7 @@ export default function WumpusBoard() {
   useEffect(() => {
     const newWorld = createWorld(config);
     setWorld(newWorld);
-    socket.emit("init_world", { world: newWorld, arrows: 0 });
+    socket.emit("init_world", { world: newWorld, arrows: 0, binary: true });
   }, [config]);
 
   return (
@@ -21,7 +21,7 @@ export interface KnowledgeCell {
   safe: boolean;
   confirmed_pit: boolean;
   confirmed_wumpus: boolean;
-  percepts: Percepts;
+  percepts: Partial<Percepts>; // {} until the cell is visited
   p_pit: number;
   p_wumpus: number;
 }
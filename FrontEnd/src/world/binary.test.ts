@@ -0,0 +1,43 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fixture from "./__fixtures__/binary_payload.json" with { type: "json" };
+import { decodeAgentState, type BinaryAgentState } from "./binary.ts";
+
+// the fixture is produced by BackEnd/tests/test_board.py from the Python
+// encoder, so this checks the full encode -> decode round trip
+
+function payload(): BinaryAgentState {
+  const { world, knowledge, ...rest } = fixture.payload;
+  return {
+    ...(rest as Omit<BinaryAgentState, "world" | "knowledge">),
+    encoding: "binary",
+    world: Uint8Array.from(world),
+    knowledge: {
+      flags: Uint8Array.from(knowledge.flags),
+      p_pit: Uint8Array.from(knowledge.p_pit),
+      p_wumpus: Uint8Array.from(knowledge.p_wumpus),
+    },
+  };
+}
+
+test("decodes the packed grids written by the backend", () => {
+  const state = decodeAgentState(payload());
+
+  assert.deepEqual(state.world, fixture.expected.world);
+  assert.deepEqual(state.knowledge, fixture.expected.knowledge);
+  assert.equal(state.arrows, fixture.payload.arrows);
+});
+
+test("accepts ArrayBuffer attachments", () => {
+  const data = payload();
+  data.world = (data.world as Uint8Array).buffer;
+
+  assert.deepEqual(decodeAgentState(data).world, fixture.expected.world);
+});
+
+test("passes JSON payloads through", () => {
+  const json = decodeAgentState(payload());
+
+  assert.ok(!("encoding" in json));
+  assert.equal(decodeAgentState(json), json);
+});
@@ -0,0 +1,84 @@
+import type { AgentState, Cell, KnowledgeCell } from "@/types/type";
+
+/* ───────────── packed grid layout (BackEnd/board.py) ───────────── */
+
+const CELL_TYPES: Cell[] = ["empty", "pit", "wumpus", "gold", "arrow"];
+
+const VISITED = 1 << 0;
+const SAFE = 1 << 1;
+const CONFIRMED_PIT = 1 << 2;
+const CONFIRMED_WUMPUS = 1 << 3;
+
+const BREEZE = 1 << 4;
+const STENCH = 1 << 5;
+const GLITTER = 1 << 6;
+const ARROW = 1 << 7;
+
+type Plane = ArrayBuffer | Uint8Array;
+
+export interface BinaryAgentState
+  extends Omit<AgentState, "world" | "knowledge"> {
+  encoding: "binary";
+  world: Plane;
+  knowledge: { flags: Plane; p_pit: Plane; p_wumpus: Plane };
+}
+
+function bytes(plane: Plane) {
+  return plane instanceof Uint8Array ? plane : new Uint8Array(plane);
+}
+
+/* ───────────────── decoding ───────────────── */
+
+// agent_update / world_ready payloads come as plain JSON unless the world
+// was initialised with `binary: true`; both end up as AgentState here
+export function decodeAgentState(
+  data: AgentState | BinaryAgentState
+): AgentState {
+  if (!("encoding" in data)) return data;
+
+  const size = data.size;
+  const world = bytes(data.world);
+  const flags = bytes(data.knowledge.flags);
+  const pPit = bytes(data.knowledge.p_pit);
+  const pWumpus = bytes(data.knowledge.p_wumpus);
+
+  const grid: Cell[][] = [];
+  const knowledge: KnowledgeCell[][] = [];
+
+  for (let i = 0; i < size; i++) {
+    const gridRow: Cell[] = [];
+    const kbRow: KnowledgeCell[] = [];
+
+    for (let j = 0; j < size; j++) {
+      const k = i * size + j;
+      const bits = flags[k];
+
+      gridRow.push(CELL_TYPES[world[k]]);
+      kbRow.push({
+        visited: Boolean(bits & VISITED),
+        safe: Boolean(bits & SAFE),
+        confirmed_pit: Boolean(bits & CONFIRMED_PIT),
+        confirmed_wumpus: Boolean(bits & CONFIRMED_WUMPUS),
+        // percepts are only known once the cell was visited, as in the JSON
+        percepts:
+          bits & VISITED
+            ? {
+                breeze: Boolean(bits & BREEZE),
+                stench: Boolean(bits & STENCH),
+                glitter: Boolean(bits & GLITTER),
+                arrow: Boolean(bits & ARROW),
+              }
+            : {},
+        p_pit: pPit[k] / 255,
+        p_wumpus: pWumpus[k] / 255,
+      });
+    }
+
+    grid.push(gridRow);
+    knowledge.push(kbRow);
+  }
+
+  // eslint-disable-next-line @typescript-eslint/no-unused-vars
+  const { encoding, ...fields } = data;
+  return { ...fields, world: grid, knowledge };
+}